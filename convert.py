@@ -1,7 +1,10 @@
 import argparse
+import concurrent.futures
+import itertools
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
 
@@ -18,10 +21,15 @@ class UnObsolizer(object):
       unob.get_files_from_args()
       unob.parse_files()
     """
+    __slots__ = ('files', 'parsers')
+
     prompt_confirmation = True
     new_extension = None
     git_move = False
     global_function_dict = {}
+    # Total size of the input files below which starting worker processes
+    # costs more than it saves
+    parallel_min_bytes = 1 << 20
 
     def __init__(self):
         self.files = []
@@ -41,7 +49,7 @@ class UnObsolizer(object):
             self.append_directory_files(
                 only_current_dir=not args.recurse)
         input_file_re = re.compile(args.input_re)
-        self.files = [ f for f in self.files if (re.search(input_file_re, f)) ]
+        self.files = [ f for f in self.files if (input_file_re.search(f)) ]
         self.files.extend([os.path.join(os.getcwd(), f) for f in args.files])
 
         for f in self.files:
@@ -56,11 +64,24 @@ class UnObsolizer(object):
         Args:
         only_current_dir (bool): do not recurse into all other directories
         """
-        for (dirpath, dirnames, filenames) in os.walk(os.getcwd()):
-            for f in filenames:
-                self.files.append(os.path.join(dirpath, f))
-            if only_current_dir:
-                break;
+        # os.scandir hands back the entry type and full path without the
+        # extra stat and os.path.join calls that os.walk performs. Like
+        # os.walk, directories that cannot be read are skipped.
+        # Sub-directories are pushed in reverse so that they are popped, and
+        # their files listed, in the same top-down order as os.walk.
+        dirs = [os.getcwd()]
+        while dirs:
+            subdirs = []
+            try:
+                with os.scandir(dirs.pop()) as entries:
+                    for entry in entries:
+                        if not entry.is_dir():
+                            self.files.append(entry.path)
+                        elif not only_current_dir and not entry.is_symlink():
+                            subdirs.append(entry.path)
+            except OSError:
+                pass
+            dirs.extend(reversed(subdirs))
 
     def parse_arguments(self):
         """
@@ -108,12 +129,92 @@ class UnObsolizer(object):
         """
         Triggers the parsing process for all files in the list 'self.files'.
         First fix function declarations, then forward declarations.
+
+        Files are parsed in worker processes when there are several CPUs and
+        enough input to make up for starting them, unless the user has to
+        confirm each change, since the prompts need the terminal.
+        """
+        if not self.use_worker_processes():
+            for p in self.parsers:
+                p.convert_func_decl()
+
+            for p in self.parsers:
+                p.convert_forward_decl()
+        else:
+            self.parse_files_in_parallel()
+
+        if UnObsolizer.new_extension and UnObsolizer.git_move:
+            self.git_move_files()
+
+    def git_move_files(self):
         """
+        Records the change of extension of all converted files in Git. This
+        has the same effect as a `git mv` per file, but takes a single
+        `git rm` and `git add` for the whole list.
+        """
+        renames = [(p.input_file_name, p.output_file_name)
+                   for p in self.parsers
+                   if p.output_file_name != p.input_file_name]
+        if not renames:
+            return
+        commands = (
+            ['git', 'rm', '--cached', '--quiet', '--'] +
+            [old for old, _ in renames],
+            ['git', 'add', '--'] + [new for _, new in renames])
+        for command in commands:
+            if subprocess.call(command):
+                print(f'Fatal error while performing `git {command[1]}`. '
+                      'Exiting')
+                exit(1)
+
+    def use_worker_processes(self):
+        """
+        Decides whether `parse_files` should hand the files to a pool of
+        worker processes.
+
+        Returns:
+        bool: True if the files should be parsed in parallel
+        """
+        if (UnObsolizer.prompt_confirmation or len(self.parsers) < 2 or
+                (os.cpu_count() or 1) < 2):
+            return False
+        total_size = 0
         for p in self.parsers:
-            p.convert_func_decl()
+            try:
+                total_size += os.path.getsize(p.input_file_name)
+            except OSError:
+                pass
+            if total_size >= UnObsolizer.parallel_min_bytes:
+                return True
+        return False
+
+    def parse_files_in_parallel(self):
+        """
+        Runs both passes of `parse_files` in a pool of worker processes.
+        The global function data collected by the first pass is merged, in
+        file order, into UnObsolizer.global_function_dict and handed to the
+        second pass tasks.
 
+        Tasks are sent in chunks, so that the merged dictionary is pickled
+        once per chunk rather than once per file.
+        """
+        new_extension = itertools.repeat(UnObsolizer.new_extension)
+        chunksize = max(1, len(self.parsers) // (4 * (os.cpu_count() or 1)))
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            results = list(executor.map(
+                convert_func_decl_worker, self.parsers, new_extension,
+                chunksize=chunksize))
+            self.parsers = []
+            for parser, global_function_dict in results:
+                self.parsers.append(parser)
+                UnObsolizer.global_function_dict.update(global_function_dict)
+
+            list(executor.map(
+                convert_forward_decl_worker, self.parsers, new_extension,
+                itertools.repeat(UnObsolizer.global_function_dict),
+                chunksize=chunksize))
         for p in self.parsers:
-            p.convert_forward_decl()
+            p.converted_text = ''
 
 class FileParser(object):
     """
@@ -130,6 +231,12 @@ class FileParser(object):
     # This method depends on the dictionaries
     parser.convert_forward_decl
     """
+    __slots__ = (
+        'current_state', 'state_handlers', 'function_name', 'arg_types',
+        'arg_names', 'arg_pointers', 'previous_line', 'function_args_count',
+        'function_dict', 'function_ret_type', 'function_is_global',
+        'accumulated_lines', 'output_lines', 'converted_text',
+        'input_file_name', 'output_file_name', 'backup_file_name')
 
     # Parser states
     SEARCH_FOR_FUNC = 1
@@ -151,10 +258,16 @@ class FileParser(object):
         r'^\s*(?P<static>static)?\s*(extern)?\s*'
         r'(?P<type>[a-zA-Z_][a-zA-Z0-9_]*)?\s*\*?\s*'
         r'(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)\s*\(\s*\)\s*;\s*$')
-    file_ext_re = re.compile(
-        r'(?P<name>.*)\.[0-9a-zA-Z]+$')
-    whitespace_re = re.compile(
-        r'^\s*$')
+    paren_re = re.compile(
+        r'\((.*)\)')
+
+    # Versions of the patterns above that find candidate lines in a whole
+    # file at once; whitespace may not span a line break.
+    function_name_scan_re = re.compile(
+        function_name_re.pattern.replace(r'\s', r'[^\S\n]'), re.MULTILINE)
+    forward_declaration_scan_re = re.compile(
+        forward_declaration_re.pattern.replace(r'\s', r'[^\S\n]'),
+        re.MULTILINE)
 
     def __init__(self, input_file_name):
         """
@@ -168,87 +281,157 @@ class FileParser(object):
         input_file_name (string): the file to operate on
         """
         self.current_state = FileParser.SEARCH_FOR_FUNC
+        self.state_handlers = {
+            FileParser.SEARCH_FOR_FUNC: self.search_for_func,
+            FileParser.READ_ARGUMENTS: self.read_arguments,
+            FileParser.REPLACE_FUNCTION: self.replace_function,
+        }
         self.function_name = ''
-        self.function_args = []
+        self.arg_types = []
+        self.arg_names = []
+        self.arg_pointers = []
         self.previous_line = ''
         self.function_args_count = 0
         self.function_dict = {}
         self.function_ret_type = ''
         self.function_is_global = False
         self.accumulated_lines = []
+        self.output_lines = []
+        self.converted_text = ''
         self.input_file_name = input_file_name
 
     def convert_func_decl(self):
         """
         Read through self.input_file_name and replace all obsolete function
-        declarations. Note that this method writes to a temporary file `*.tmp`
-        and not to the final output file. You must call `convert_forward_decl`
-        after this method to create the proper output file.
+        declarations. Note that this method keeps the converted text in
+        memory (`self.converted_text`) and does not write the output file.
+        You must call `convert_forward_decl` after this method to create the
+        proper output file.
 
-        This method creates a backup file `*.bak` in case of disaster.
+        The original file is left untouched; it is saved as a backup file
+        `*.bak` by `convert_forward_decl`, just before the output is written.
 
         Stores all converted static functions in self.function_dict, and all
         converted global functions in UnObsolizer.global_function_dict.
         """
-        # Save original file in case of disaster
-        backup_file_name = '{}.bak'.format(self.input_file_name)
-        self.temp_file_name = '{}.tmp'.format(self.input_file_name)
+        self.backup_file_name = f'{self.input_file_name}.bak'
         self.output_file_name = self.input_file_name
         if UnObsolizer.new_extension:
-            no_ext_name = re.search(FileParser.file_ext_re,
-                                    self.input_file_name)
-            if no_ext_name:
-                self.output_file_name = '{}.{}'.format(
-                    no_ext_name.group('name'),
-                    UnObsolizer.new_extension)
-        shutil.copyfile(self.input_file_name, backup_file_name)
-        self.output_file = open(self.output_file_name, 'w+')
-        self.operate_on_file(backup_file_name, self.function_converter)
-        self.output_file.close()
-        shutil.copyfile(self.output_file_name, self.temp_file_name)
+            root, ext = os.path.splitext(self.input_file_name)
+            if ext:
+                self.output_file_name = f'{root}.{UnObsolizer.new_extension}'
+        self.output_lines = []
+        self.operate_on_file(self.input_file_name,
+                             FileParser.function_name_scan_re,
+                             self.function_converter)
+        self.converted_text = ''.join(self.output_lines)
+        self.output_lines = []
+        # A header left unfinished at the end of the file must not keep the
+        # state machine running during the forward declaration pass
+        self.reset_state()
 
     def convert_forward_decl(self):
         """
-        Read through self.temp_file_name created in `convert_func_decl` and
+        Read through self.converted_text created in `convert_func_decl` and
         replace all incorrect forward declarations.
         When this method returns, the final output file will be created
-        (with optional new extension or git mv).
+        (with optional new extension).
 
         For static functions, this method pulls data from self.function_dict.
         For global functions, this method pulls data from
         UnObsolizer.global_function_dict
         """
-        self.output_file = open(self.output_file_name, 'w+')
-        self.operate_on_file(self.temp_file_name, self.declaration_converter)
-        self.output_file.close()
-        os.remove(self.temp_file_name)
-        if UnObsolizer.new_extension:
-            os.remove(self.input_file_name)
-            if UnObsolizer.git_move:
-                shutil.move(self.output_file_name, self.input_file_name)
-                ret_val = subprocess.call(
-                    ['git', 'mv', self.input_file_name, self.output_file_name])
-                if ret_val:
-                    print('Fatal error while performing `git mv`. '
-                          'Exiting')
-                    exit(1)
-
-    def operate_on_file(self, file_name, handle):
-        """
-        Calls the passed in function on every line of the specified file.
+        self.output_lines = []
+        self.operate_on_text(self.converted_text,
+                             FileParser.forward_declaration_scan_re,
+                             self.declaration_converter)
+        self.converted_text = ''
+        self.flush_output()
+
+    def operate_on_file(self, file_name, line_re, handle):
+        """
+        Reads the whole specified file and passes it on to `operate_on_text`.
+
+        Args:
+        file_name (string): name of the file to read
+        line_re (re.Pattern): multi-line pattern matching the lines to handle
+        handle (function(string)): the function to call for the handled lines
+          (takes the line of the file as an argument)
+        """
+        with open(file_name, 'r') as file_:
+            text = file_.read()
+        self.operate_on_text(text, line_re, handle)
+
+    def operate_on_text(self, text, line_re, handle):
+        """
+        Calls the passed in function on every line of 'text' matched by
+        'line_re', and then on each following line for as long as the
+        function keeps the state machine out of SEARCH_FOR_FUNC. All other
+        text cannot start a match and is copied to self.output_lines as is,
+        without being split into lines.
         There will be two passes on the file, so this is useful to avoid
         redundant code.
 
         Args:
-        file_name (string): name of the file to read
-        handle (function(string)): the function to call for every line of the
-          file (takes the line of the file as an argument)
+        text (string): the contents of the file to operate on
+        line_re (re.Pattern): multi-line pattern matching the lines to handle
+        handle (function(string)): the function to call for the handled lines
+          (takes the line of the file as an argument)
+        """
+        search_state = FileParser.SEARCH_FOR_FUNC
+        find = text.find
+        text_len = len(text)
+        pos = 0
+        for match in line_re.finditer(text):
+            start = match.start()
+            if start < pos:
+                # Line was already consumed by the state machine
+                continue
+            self.output_lines.append(text[pos:start])
+            line_start = text.rfind('\n', 0, start - 1) + 1 if start else 0
+            self.previous_line = text[line_start:start]
+            pos = start
+            while True:
+                end = find('\n', pos) + 1 or text_len
+                line = text[pos:end]
+                handle(line)
+                self.previous_line = line
+                pos = end
+                if self.current_state == search_state or pos == text_len:
+                    break
+        self.output_lines.append(text[pos:])
+
+    def flush_output(self):
+        """
+        Writes the lines buffered in `self.output_lines` to
+        `self.output_file_name` in a single call, then empties the buffer.
+        Handlers only append to the buffer so that the output file is not
+        written one line at a time.
+
+        The original file is saved as a backup first, and the output file
+        gets its permissions.
+        """
+        self.backup_input_file()
+        with open(self.output_file_name, 'w', buffering=1 << 16) as file_:
+            file_.writelines(self.output_lines)
+        shutil.copymode(self.backup_file_name, self.output_file_name)
+        self.output_lines = []
+
+    def backup_input_file(self):
+        """
+        Saves self.input_file_name as self.backup_file_name in case of
+        disaster. A plain file is moved rather than copied, since the output
+        file is about to be written anyway. Symbolic and hard links are
+        copied, so that the output is written through them to the file they
+        point at.
         """
-        file_ = open(file_name, 'r')
-        for line in file_:
-            handle(line)
-            self.previous_line = line
-        file_.close()
+        input_stat = os.lstat(self.input_file_name)
+        if stat.S_ISREG(input_stat.st_mode) and input_stat.st_nlink == 1:
+            os.replace(self.input_file_name, self.backup_file_name)
+        else:
+            shutil.copy2(self.input_file_name, self.backup_file_name)
+            if self.output_file_name != self.input_file_name:
+                os.remove(self.input_file_name)
 
     def function_converter(self, line):
         """
@@ -258,14 +441,12 @@ class FileParser(object):
         Args:
         line (string): the current string to be processing
         """
-        if self.current_state is FileParser.SEARCH_FOR_FUNC:
-            self.search_for_func(line)
-        elif self.current_state is FileParser.READ_ARGUMENTS:
-            self.read_arguments(line)
-        elif self.current_state is FileParser.REPLACE_FUNCTION:
-            self.replace_function(line)
+        self.state_handlers[self.current_state](line)
 
-    def search_for_func(self, line):
+    # The per-line handlers below take the bound methods of the patterns they
+    # use as default arguments, so calling them is a local variable access.
+    def search_for_func(self, line, _name_search=function_name_re.search,
+                        _ret_search=return_value_re.search):
         """
         Searches 'line' for a function declaration of the form:
         '[name]([arg], [arg])'.
@@ -279,7 +460,7 @@ class FileParser(object):
           arguments expected
         function_args_count: set to the expected number of arguments
         """
-        func_name_match = re.search(FileParser.function_name_re, line)
+        func_name_match = _name_search(line)
         if func_name_match:
             self.accumulated_lines.append(line)
 
@@ -289,8 +470,7 @@ class FileParser(object):
                     func_name_match.group('args').split(','))
 
             # Use 'int' if there is no return value
-            ret_value_match = re.search(FileParser.return_value_re,
-                                        self.previous_line)
+            ret_value_match = _ret_search(self.previous_line)
             if ret_value_match:
                 if ret_value_match.group('static'):
                     self.function_is_global = False
@@ -305,91 +485,103 @@ class FileParser(object):
             else:
                 self.current_state = FileParser.READ_ARGUMENTS
         else:
-             self.output_file.write(line)
+             self.output_lines.append(line)
              self.reset_state()
 
-    def read_arguments(self, line):
+    def read_arguments(self, line, _arg_search=function_arg_re.search):
         """
         Reads the arguments that follow the function declaration. Stores
-        them in a tuple for re-writing later.
+        their types, names and pointer flags for re-writing later.
 
         Args:
         line (string): the string to search for an argument in
 
         Modified instance variables:
-        function_args: add found argument tuples to the list
+        arg_types, arg_names, arg_pointers: add the found argument to the
+          lists
         current_state: set to next state when all arguments have been found
         """
         self.accumulated_lines.append(line)
-        arg_match = re.search(FileParser.function_arg_re, line)
+        arg_match = _arg_search(line)
         if arg_match:
-            arg_type = arg_match.group('type')
-            arg_name = arg_match.group('name')
-            arg_ptr = True if arg_match.group('pointer') else False
-            self.function_args.append((arg_type, arg_name, arg_ptr))
-            if len(self.function_args) is self.function_args_count:
+            self.arg_types.append(arg_match.group('type'))
+            self.arg_names.append(arg_match.group('name'))
+            self.arg_pointers.append(True if arg_match.group('pointer')
+                                     else False)
+            if len(self.arg_names) == self.function_args_count:
                 self.current_state = FileParser.REPLACE_FUNCTION
-        elif re.search(FileParser.whitespace_re, line):
+        elif not line or line.isspace():
             pass
         else:
             self.write_accumulator()
             self.reset_state()
 
-    def replace_function(self, line):
+    def replace_function(self, line,
+                         _begin_search=function_begin_re.search):
         """
         Replaces the obsolete function header with the new one built from
-        the function name and the argument tuples. Then resets the state
+        the function name and the argument lists. Then resets the state
         machine.
 
+        The converted argument list is stored by function name, ready to be
+        reused as is by `declaration_converter`.
+
         Args:
         line (string): the line containing the opening brace of the function
         """
-        open_curley_match = re.search(FileParser.function_begin_re, line)
+        open_curley_match = _begin_search(line)
         if open_curley_match:
-            function_declaration = self.function_name
-            function_declaration += '('
-            index = 1
-            for arg in self.function_args:
-                function_declaration += '{}{} {}'.format(
-                    arg[0],
-                    '*' if arg[2] else '',
-                    arg[1])
-                if index < len(self.function_args):
-                    function_declaration += ', '
-                index += 1
-            function_declaration += ')\n'
-            confirmation = 'y'
-            if UnObsolizer.prompt_confirmation:
-                print('Replace?\n')
-                for al in self.accumulated_lines:
-                    print(al.rstrip('\n'))
-                print('--with--')
-                print(function_declaration)
-                confirmation = input('y/n [y]')
-            if confirmation == 'n':
-                self.output_file.write(self.function_ret_type)
-                self.output_file.writelines(self.accumulated_lines)
+            args_str = ', '.join(
+                f"{t}{'*' if p else ''} {n}"
+                for t, n, p in zip(self.arg_types, self.arg_names,
+                                   self.arg_pointers))
+            function_declaration = f'{self.function_name}({args_str})\n'
+            if (UnObsolizer.prompt_confirmation and
+                    not self.confirm_replacement(self.accumulated_lines,
+                                                 function_declaration)):
+                self.output_lines.append(self.function_ret_type)
+                self.output_lines.extend(self.accumulated_lines)
             else:
-                self.output_file.write(function_declaration)
+                self.output_lines.append(function_declaration)
                 if self.function_is_global:
-                    UnObsolizer.global_function_dict[self.function_name] = self.function_args
+                    UnObsolizer.global_function_dict[self.function_name] = args_str
                 else:
-                    self.function_dict[self.function_name] = self.function_args
-            self.output_file.write(line)
-        elif re.search(FileParser.whitespace_re, line):
+                    self.function_dict[self.function_name] = args_str
+            self.output_lines.append(line)
+        elif not line or line.isspace():
             return
         else:
-            self.output_file.writelines(self.accumulated_lines)
-            self.output_file.write(line)
+            self.output_lines.extend(self.accumulated_lines)
+            self.output_lines.append(line)
         self.reset_state()
 
+    def confirm_replacement(self, old_lines, new_text):
+        """
+        Asks the user whether 'old_lines' should be replaced with 'new_text'.
+        Only called when UnObsolizer.prompt_confirmation is set, so that the
+        non-interactive mode does not go through the prompt logic at all.
+
+        Args:
+        old_lines (list of string): the lines that would be replaced
+        new_text (string): the replacement
+
+        Returns:
+        bool: False if the user declined the replacement
+        """
+        print('Replace?\n')
+        for ol in old_lines:
+            print(ol.rstrip('\n'))
+        print('--with--')
+        print(new_text)
+        return input('y/n [y]') != 'n'
+
     def write_accumulator(self):
         """
-        Writes the contents of `self.accumulated_lines` to `self.output_file`.
+        Writes the contents of `self.accumulated_lines` to `self.output_lines`.
 
         `self.accumulated_lines' is not modified.
         """
-        self.output_file.writelines(self.accumulated_lines)
+        self.output_lines.extend(self.accumulated_lines)
 
     def reset_state(self):
         """
@@ -398,11 +590,15 @@ class FileParser(object):
         self.current_state = FileParser.SEARCH_FOR_FUNC
         self.accumulated_lines = []
         self.function_name = ''
-        self.function_args = []
+        self.arg_types = []
+        self.arg_names = []
+        self.arg_pointers = []
         self.function_ret_type = ''
         self.function_args_count = 0
 
-    def declaration_converter(self, line):
+    def declaration_converter(self, line,
+                              _fwd_search=forward_declaration_re.search,
+                              _paren_sub=paren_re.sub):
         """
         Scans the line for a forward declaration. If an empty forward
         delcaration exists, and we have un-obsolized the function
@@ -411,47 +607,72 @@ class FileParser(object):
         Args:
         line (string): The line to scan for a forward declaration
         """
-        forward_decl_match = re.search(FileParser.forward_declaration_re, line)
+        forward_decl_match = _fwd_search(line)
         if forward_decl_match:
             # Ensure we have arguments for this forward declaration
             func_name = forward_decl_match.group('name')
             try:
                 if forward_decl_match.group('static'):
-                    args_tuple_list = self.function_dict[func_name]
+                    new_forward_decl_args = self.function_dict[func_name]
                 else:
-                    args_tuple_list = UnObsolizer.global_function_dict[func_name]
+                    new_forward_decl_args = UnObsolizer.global_function_dict[func_name]
             except KeyError:
-                self.output_file.write(line)
+                self.output_lines.append(line)
                 return
-            new_forward_decl_args = ''
-            index = 1
-            for arg_tuple in args_tuple_list:
-                new_forward_decl_args += arg_tuple[0]
-                if arg_tuple[2]:
-                    new_forward_decl_args += '* '
-                else:
-                    new_forward_decl_args += ' '
-                new_forward_decl_args += arg_tuple[1]
-                if index < len(args_tuple_list):
-                    new_forward_decl_args += ', '
-                index += 1
-            repl = re.sub(
-                '\((.*)\)',
-                '({})'.format(new_forward_decl_args),
+            repl = _paren_sub(
+                f'({new_forward_decl_args})',
                 line)
-            confirmation = 'y'
-            if UnObsolizer.prompt_confirmation:
-                print('Replace?\n')
-                print(line.rstrip('\n'))
-                print('--with--')
-                print(repl)
-                confirmation = input('y/n [y]')
-            if confirmation == 'n':
-                self.output_file.write(line)
+            if (UnObsolizer.prompt_confirmation and
+                    not self.confirm_replacement([line], repl)):
+                self.output_lines.append(line)
             else:
-                self.output_file.write(repl)
+                self.output_lines.append(repl)
         else:
-            self.output_file.write(line)
+            self.output_lines.append(line)
+
+
+def set_worker_options(new_extension):
+    """
+    Sets up the UnObsolizer options a task of
+    `UnObsolizer.parse_files_in_parallel` needs; they are not inherited when
+    worker processes are spawned rather than forked.
+
+    Args:
+    new_extension (string): value for UnObsolizer.new_extension
+    """
+    UnObsolizer.prompt_confirmation = False
+    UnObsolizer.new_extension = new_extension
+
+
+def convert_func_decl_worker(parser, new_extension):
+    """
+    Runs `FileParser.convert_func_decl` in a worker process.
+
+    Args:
+    parser (FileParser): the parser to run
+    new_extension (string): value for UnObsolizer.new_extension
+
+    Returns:
+    tuple: the updated parser, and the global functions it converted
+    """
+    set_worker_options(new_extension)
+    UnObsolizer.global_function_dict = {}
+    parser.convert_func_decl()
+    return parser, UnObsolizer.global_function_dict
+
+
+def convert_forward_decl_worker(parser, new_extension, global_function_dict):
+    """
+    Runs `FileParser.convert_forward_decl` in a worker process.
+
+    Args:
+    parser (FileParser): the parser to run
+    new_extension (string): value for UnObsolizer.new_extension
+    global_function_dict (dict): the global functions converted in all files
+    """
+    set_worker_options(new_extension)
+    UnObsolizer.global_function_dict = global_function_dict
+    parser.convert_forward_decl()
 
 
 if __name__ == '__main__':